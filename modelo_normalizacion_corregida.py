@@ -20,7 +20,7 @@ COMPONENTES PRINCIPALES:
   * Producción (PR): Cantidad producida en bancos regionales
   * Inventarios (IR, IH, IK): Niveles de inventario en cada nodo
   * Obsolescencia (WO_*): Sangre que debe desecharse por caducidad
-  * Activación (y_*): Variables binarias para activar instalaciones
+  * Activación (y_*): Variables en [0, 1] (0/1 en el óptimo) para activar instalaciones
 
 - Restricciones:
   1. Balance de inventario (conservación de masa en cada nodo)
@@ -56,7 +56,7 @@ VALORES DE NORMALIZACIÓN:
   - Cumplimiento de referencia: 1.3185 (~131.85%)
   - Emisiones de referencia: 203.94 kg CO2e
 
-SOLVER: GLPK (GNU Linear Programming Kit)
+SOLVER: HiGHS (a través de la interfaz persistente appsi de Pyomo)
 
 AUTOR/FUENTE: Caso de estudio East Kalimantan - Cadena de suministro de sangre
 ============================================================================
@@ -65,31 +65,45 @@ AUTOR/FUENTE: Caso de estudio East Kalimantan - Cadena de suministro de sangre
 # ===========================
 # IMPORTACIÓN DE LIBRERÍAS
 # ===========================
-# subprocess: Para ejecutar comandos del sistema operativo
-import subprocess
 # sys: Para acceder a funcionalidades del sistema
 import sys
+# os: Para consultar el número de núcleos disponibles (hilos del solver)
+import os
 # random: Para generación de números aleatorios (usado para semilla de reproducibilidad)
 import random
+# itertools.product: Producto cartesiano de conjuntos (implementado en C)
+from itertools import product
+# ProcessPoolExecutor: Resolver escenarios independientes (barridos de pesos) en paralelo
+from concurrent.futures import ProcessPoolExecutor
+# multiprocessing: Contexto de arranque (spawn) de los procesos del barrido
+import multiprocessing
+# numpy: Arreglos densos para almacenar los parámetros (un arreglo por parámetro)
+import numpy as np
 # pyomo.environ: Framework de optimización matemática en Python
 from pyomo.environ import *
+# LinearExpression: Expresión lineal construida directamente desde listas de coeficientes y variables
+from pyomo.core.expr import LinearExpression
+# appsi: Interfaces de solvers en memoria (HiGHS vía highspy, sin archivos LP intermedios)
+from pyomo.contrib import appsi
 
 # Establecer semilla aleatoria para reproducibilidad de resultados
 random.seed(42)
 
 # ===========================
-# CONFIGURACIÓN DEL SOLVER GLPK
+# CONFIGURACIÓN DEL SOLVER HiGHS
 # ===========================
-# GLPK (GNU Linear Programming Kit) es el solver de optimización lineal que se usará
-print("\n📦 Configurando GLPK...")
-try:
-    # Intenta instalar GLPK automáticamente usando apt-get (para entornos Linux/Colab)
-    subprocess.run(['apt-get', 'install', '-y', '-qq', 'glpk-utils'],
-                  capture_output=True, text=True, timeout=60)
-    print("✓ GLPK listo")
-except:
-    # Si falla la instalación automática, muestra instrucciones manuales
-    print("⚠️ Ejecuta: !apt-get install -y glpk-utils")
+# HiGHS es el solver de optimización lineal/entera que se usará; Pyomo se
+# comunica con él en memoria a través de highspy (no se escriben archivos LP).
+# Los mensajes de progreso solo se imprimen al ejecutar el script: los procesos
+# del barrido (spawn) importan este módulo y los repetirían intercalados
+if __name__ == "__main__":
+    print("\n📦 Configurando HiGHS...")
+if not appsi.solvers.Highs().available():
+    # Si highspy no está instalado, muestra instrucciones manuales y termina
+    print("⚠️ HiGHS no encontrado. Ejecuta: !pip install highspy")
+    sys.exit(1)
+if __name__ == "__main__":
+    print("✓ HiGHS listo")
 
 # ===========================
 # DEFINICIÓN DE CONJUNTOS
@@ -120,11 +134,33 @@ P = ["A", "B", "AB", "O"]
 # T: Períodos de tiempo - 45 períodos de planificación (ej: 45 días)
 T = list(range(1, 46))
 
+# POS_*: Posición de cada etiqueta en su conjunto, es decir, su índice entero en el
+# eje correspondiente de los arreglos de parámetros (p. ej. PA_arr[POS_T[t], POS_P[p], POS_R[r]])
+POS_T, POS_P, POS_I, POS_J, POS_R, POS_H, POS_K = (
+    {e: n for n, e in enumerate(c)} for c in (T, P, I, J, R, H, K))
+
+# RR_pairs: Pares de bancos regionales distintos (r1 != r2) para las transferencias
+# entre bancos; se calculan una vez en lugar de filtrar r1 != r2 en cada suma
+RR_pairs = [(r1, r2) for r1 in R for r2 in R if r1 != r2]
+# RR_entrantes / RR_salientes: Para cada banco regional, posiciones en RR_pairs de las
+# transferencias que recibe (r2 -> r) y que envía (r -> r2); evita filtrar r2 != r
+# en cada fila del balance
+RR_entrantes = {r: [n for n, (_, r2) in enumerate(RR_pairs) if r2 == r] for r in R}
+RR_salientes = {r: [n for n, (r1, _) in enumerate(RR_pairs) if r1 == r] for r in R}
+# Posiciones (ejes r1, r2) de esos pares para seleccionarlos en los arreglos R x R
+# (dos arreglos enteros, vacíos si hay un único banco regional)
+RR_pos = (np.array([POS_R[r1] for r1, _ in RR_pairs], dtype=int),
+          np.array([POS_R[r2] for _, r2 in RR_pairs], dtype=int))
+
+# Tamaños de los conjuntos (dimensiones de los arreglos de parámetros)
+nT, nP, nI, nJ, nR, nH, nK, nU = len(T), len(P), len(I), len(J), len(R), len(H), len(K), len(U)
+
 # ===========================
 # FUNCIONES AUXILIARES
 # ===========================
 # Estas funciones calculan valores centrales de rangos para usar valores determinísticos
-# en lugar de valores aleatorios, lo que permite replicar el caso de estudio
+# en lugar de valores aleatorios, lo que permite replicar el caso de estudio.
+# El valor central de cada rango se calcula una sola vez (constantes *_MID)
 
 def central_int(a, b):
     """Retorna el valor entero central del rango [a, b]
@@ -161,6 +197,7 @@ DEMAND_K_MIN, DEMAND_K_MAX = 0, 250
 
 # PROD: Rango de capacidad de producción de los bancos regionales [unidades]
 PROD_MIN, PROD_MAX = 300, 450
+PROD_MID = central_int(PROD_MIN, PROD_MAX)
 
 # SC: Capacidades de almacenamiento [unidades]
 # SC_r_val: Capacidad de almacenamiento en bancos regionales (RBB)
@@ -171,6 +208,9 @@ SC_r_val, SC_h_val, SC_k_val = 10000, 2000, 2000
 # ALPHA: Vida útil de la sangre en períodos (25 días)
 ALPHA = 25
 
+# T_post_alpha: Períodos en los que ya puede haber sangre caducada (t > ALPHA)
+T_post_alpha = [t for t in T if t > ALPHA]
+
 # ----------------------------
 # PARÁMETROS DE COSTOS FIJOS
 # ----------------------------
@@ -184,24 +224,31 @@ FC_BM, FC_LBDC = 500_000, 750_000
 # ----------------------------
 # PRICE_H: Rango de precio de venta a hospitales [IDR/unidad]
 PRICE_H_MIN, PRICE_H_MAX = 288_000, 292_000
+PRICE_H_MID = central_int(PRICE_H_MIN, PRICE_H_MAX)
 
 # PRICE_K: Rango de precio de venta a clínicas [IDR/unidad]
 PRICE_K_MIN, PRICE_K_MAX = 358_000, 362_000
+PRICE_K_MID = central_int(PRICE_K_MIN, PRICE_K_MAX)
 
 # OC: Rango de costo de producción/operación [IDR/unidad] (TC3 en la función objetivo)
 OC_MIN, OC_MAX = 180_000, 200_000
+OC_MID = central_int(OC_MIN, OC_MAX)
 
 # PC: Rango de costo de adquisición/compra [IDR/unidad] (TC2 en la función objetivo)
 PC_MIN, PC_MAX = 50_000, 100_000  # Revertido a valores originales
+PC_MID = central_int(PC_MIN, PC_MAX)
 
 # IC: Rango de costo de inventario/almacenamiento [IDR/unidad/período] (TC4)
 IC_MIN, IC_MAX = 130, 150
+IC_MID = central_int(IC_MIN, IC_MAX)
 
 # XC: Rango de costo de transporte [IDR/unidad/km] (TC6)
 XC_MIN, XC_MAX = 10, 50
+XC_MID = central_int(XC_MIN, XC_MAX)
 
 # WC: Rango de costo de manejo de residuos/obsolescencia [IDR/unidad] (TC5)
 WC_MIN, WC_MAX = 5_000, 7_000
+WC_MID = central_int(WC_MIN, WC_MAX)
 
 # ----------------------------
 # PARÁMETROS DE EMISIONES (CO2-equivalente)
@@ -211,12 +258,15 @@ WC_MIN, WC_MAX = 5_000, 7_000
 
 # EP: Factor de emisión de producción [kg CO2e/unidad producida]
 EP_MIN, EP_MAX = 0.017, 0.068  # 8.5x del valor original
+EP_MID = central_float(EP_MIN, EP_MAX, 6)
 
 # EI: Factor de emisión de inventario/almacenamiento [kg CO2e/unidad/período]
 EI_MIN, EI_MAX = 0.0017, 0.0068  # 8.5x del valor original
+EI_MID = central_float(EI_MIN, EI_MAX, 7)
 
 # EX: Factor de emisión de transporte [kg CO2e/unidad/km]
 EX_MIN, EX_MAX = 0.00017, 0.00068  # 8.5x del valor original
+EX_MID = central_float(EX_MIN, EX_MAX, 8)
 
 # ----------------------------
 # PARÁMETROS DE DISTANCIAS
@@ -225,68 +275,81 @@ EX_MIN, EX_MAX = 0.00017, 0.00068  # 8.5x del valor original
 # Todas usan valores centrales para reproducibilidad
 
 # d_ir: Distancias de Bancos Móviles (I) a Bancos Regionales (R)
-d_ir = {(i, r): central_float(7, 20, 2) for i in I for r in R}
+d_ir_arr = np.full((nI, nR), central_float(7, 20, 2))
 
 # d_jr: Distancias de Centros Locales (J) a Bancos Regionales (R)
-d_jr = {(j, r): central_float(3, 20, 2) for j in J for r in R}
+d_jr_arr = np.full((nJ, nR), central_float(3, 20, 2))
 
 # d_rh: Distancias de Bancos Regionales (R) a Hospitales (H)
-d_rh = {(r, h): central_float(0.5, 30, 2) for r in R for h in H}
+d_rh_arr = np.full((nR, nH), central_float(0.5, 30, 2))
 
 # d_rk: Distancias de Bancos Regionales (R) a Clínicas (K)
-d_rk = {(r, k): central_float(0.5, 30, 2) for r in R for k in K}
+d_rk_arr = np.full((nR, nK), central_float(0.5, 30, 2))
 
 # d_jh: Distancias de Centros Locales (J) a Hospitales (H)
-d_jh = {(j, h): central_float(1, 25, 2) for j in J for h in H}
+d_jh_arr = np.full((nJ, nH), central_float(1, 25, 2))
 
 # d_jk: Distancias de Centros Locales (J) a Clínicas (K)
-d_jk = {(j, k): central_float(1, 25, 2) for j in J for k in K}
+d_jk_arr = np.full((nJ, nK), central_float(1, 25, 2))
 
 # d_rr: Distancias entre Bancos Regionales (R a R)
 # Distancia fija de 18 km entre diferentes bancos, 0 para el mismo banco
-d_rr = {(r1, r2): 18.0 if r1 != r2 else 0.0 for r1 in R for r2 in R}
+d_rr_arr = np.full((nR, nR), 18.0)
+np.fill_diagonal(d_rr_arr, 0.0)
 
 # d_ru: Distancias de Bancos Regionales (R) a Centros de Residuos (U)
-d_ru = {(r, u): central_float(1.5, 32, 2) for r in R for u in U}
+d_ru_arr = np.full((nR, nU), central_float(1.5, 32, 2))
 
 # d_hu: Distancias de Hospitales (H) a Centros de Residuos (U)
-d_hu = {(h, u): central_float(1.5, 32, 2) for h in H for u in U}
+d_hu_arr = np.full((nH, nU), central_float(1.5, 32, 2))
 
 # d_ku: Distancias de Clínicas (K) a Centros de Residuos (U)
-d_ku = {(k, u): central_float(1.5, 32, 2) for k in K for u in U}
+d_ku_arr = np.full((nK, nU), central_float(1.5, 32, 2))
 
 # ----------------------------
 # PARÁMETROS DE EMISIONES POR ACTIVIDAD
 # ----------------------------
-# Diccionarios indexados por (tiempo, producto, locación) con valores centrales de emisiones
+# Arreglos con ejes (tiempo, producto, locación) con valores centrales de emisiones
 
 # EP: Emisiones de producción en bancos regionales [kg CO2e/unidad]
-EP = {(t, p, r): central_float(EP_MIN, EP_MAX, 6) for t in T for p in P for r in R}
+EP_arr = np.full((nT, nP, nR), EP_MID)
 
 # EI_r: Emisiones de inventario en bancos regionales
-EI_r = {(t, p, r): central_float(EI_MIN, EI_MAX, 7) for t in T for p in P for r in R}
+EI_r_arr = np.full((nT, nP, nR), EI_MID)
 
 # EI_h: Emisiones de inventario en hospitales
-EI_h = {(t, p, h): central_float(EI_MIN, EI_MAX, 7) for t in T for p in P for h in H}
+EI_h_arr = np.full((nT, nP, nH), EI_MID)
 
 # EI_k: Emisiones de inventario en clínicas
-EI_k = {(t, p, k): central_float(EI_MIN, EI_MAX, 7) for t in T for p in P for k in K}
+EI_k_arr = np.full((nT, nP, nK), EI_MID)
 
 # EX_*: Emisiones de transporte para cada ruta [kg CO2e/unidad/km]
-EX_ir = {(t, p, i, r): central_float(EX_MIN, EX_MAX, 8) for t in T for p in P for i in I for r in R}
-EX_jr = {(t, p, j, r): central_float(EX_MIN, EX_MAX, 8) for t in T for p in P for j in J for r in R}
-EX_jh = {(t, p, j, h): central_float(EX_MIN, EX_MAX, 8) for t in T for p in P for j in J for h in H}
-EX_jk = {(t, p, j, k): central_float(EX_MIN, EX_MAX, 8) for t in T for p in P for j in J for k in K}
-EX_rh = {(t, p, r, h): central_float(EX_MIN, EX_MAX, 8) for t in T for p in P for r in R for h in H}
-EX_rk = {(t, p, r, k): central_float(EX_MIN, EX_MAX, 8) for t in T for p in P for r in R for k in K}
-EX_rr = {(t, p, r1, r2): central_float(EX_MIN, EX_MAX, 8) for t in T for p in P for r1 in R for r2 in R if r1 != r2}
+# (en EX_rr la diagonal r1 == r2 no se usa: no hay transferencias de un banco a sí mismo)
+EX_ir_arr = np.full((nT, nP, nI, nR), EX_MID)
+EX_jr_arr = np.full((nT, nP, nJ, nR), EX_MID)
+EX_jh_arr = np.full((nT, nP, nJ, nH), EX_MID)
+EX_jk_arr = np.full((nT, nP, nJ, nK), EX_MID)
+EX_rh_arr = np.full((nT, nP, nR, nH), EX_MID)
+EX_rk_arr = np.full((nT, nP, nR, nK), EX_MID)
+EX_rr_arr = np.full((nT, nP, nR, nR), EX_MID)
+
+# EXD_*: Emisiones de transporte por unidad en cada ruta (EX * distancia) [kg CO2e/unidad]
+# Se precalculan una vez para que el límite de carbono y el objetivo
+# usen un solo coeficiente por flujo en lugar de multiplicar EX y d en cada término
+EXD_ir_arr = EX_ir_arr * d_ir_arr[None, None, :, :]
+EXD_jr_arr = EX_jr_arr * d_jr_arr[None, None, :, :]
+EXD_jh_arr = EX_jh_arr * d_jh_arr[None, None, :, :]
+EXD_jk_arr = EX_jk_arr * d_jk_arr[None, None, :, :]
+EXD_rh_arr = EX_rh_arr * d_rh_arr[None, None, :, :]
+EXD_rk_arr = EX_rk_arr * d_rk_arr[None, None, :, :]
+EXD_rr_arr = EX_rr_arr * d_rr_arr[None, None, :, :]
 
 # ----------------------------
 # PARÁMETROS DE LÍMITES AMBIENTALES
 # ----------------------------
 # CAP: Límite de emisiones de carbono por período [kg CO2e/período]
 # Este límite restringe las emisiones totales en cada período de tiempo
-CAP = {t: 1000.0 for t in T}
+CAP_arr = np.full(nT, 1000.0)
 
 # EC: Costo de emisión de carbono [IDR/kg CO2e] - Penalización económica por emisiones
 EC = 250_000.0
@@ -315,96 +378,116 @@ W1, W2, W3 = 0.5, 0.3, 0.2
 DEMAND_ADJUSTED = 13  # Aumentado de 12 para subir beneficio a ~4.5B
 
 # DM_h: Demanda de hospitales por (tiempo, producto, hospital)
-DM_h = {(t, p, h): DEMAND_ADJUSTED for t in T for p in P for h in H}
+DM_h_arr = np.full((nT, nP, nH), DEMAND_ADJUSTED)
 
 # DM_k: Demanda de clínicas por (tiempo, producto, clínica)
-DM_k = {(t, p, k): DEMAND_ADJUSTED for t in T for p in P for k in K}
+DM_k_arr = np.full((nT, nP, nK), DEMAND_ADJUSTED)
+
+# DEMANDA_TOTAL_*: Demanda total del horizonte (denominadores de TSH y TSK), calculada una vez
+DEMANDA_TOTAL_H = DM_h_arr.sum().item()
+DEMANDA_TOTAL_K = DM_k_arr.sum().item()
 
 # PA: Capacidad de producción disponible en bancos regionales
-PA = {(t, p, r): central_int(PROD_MIN, PROD_MAX) for t in T for p in P for r in R}
+PA_arr = np.full((nT, nP, nR), PROD_MID)
 
 # ----------------------------
 # CAPACIDADES DE ALMACENAMIENTO
 # ----------------------------
 # SC_r: Capacidad de almacenamiento en bancos regionales por (producto, banco)
-SC_r = {(p, r): SC_r_val for p in P for r in R}
+SC_r_arr = np.full((nP, nR), SC_r_val)
 
 # SC_h: Capacidad de almacenamiento en hospitales por (producto, hospital)
-SC_h = {(p, h): SC_h_val for p in P for h in H}
+SC_h_arr = np.full((nP, nH), SC_h_val)
 
 # SC_k: Capacidad de almacenamiento en clínicas por (producto, clínica)
-SC_k = {(p, k): SC_k_val for p in P for k in K}
+SC_k_arr = np.full((nP, nK), SC_k_val)
 
 # ----------------------------
 # PRECIOS DE VENTA
 # ----------------------------
 # SP_rh: Precio de venta de banco regional a hospital [IDR/unidad]
-SP_rh = {(t, p, r, h): central_int(PRICE_H_MIN, PRICE_H_MAX) for t in T for p in P for r in R for h in H}
+SP_rh_arr = np.full((nT, nP, nR, nH), PRICE_H_MID)
 
 # SP_rk: Precio de venta de banco regional a clínica [IDR/unidad]
-SP_rk = {(t, p, r, k): central_int(PRICE_K_MIN, PRICE_K_MAX) for t in T for p in P for r in R for k in K}
+SP_rk_arr = np.full((nT, nP, nR, nK), PRICE_K_MID)
 
 # ----------------------------
 # COSTOS DE OPERACIÓN
 # ----------------------------
 # OC: Costo de producción en bancos regionales (TC3) [IDR/unidad]
-OC = {(t, p, r): central_int(OC_MIN, OC_MAX) for t in T for p in P for r in R}
+OC_arr = np.full((nT, nP, nR), OC_MID)
 
 # PC_ir: Costo de adquisición desde bancos móviles (TC2) [IDR/unidad]
-PC_ir = {(t, p, i, r): central_int(PC_MIN, PC_MAX) for t in T for p in P for i in I for r in R}  # TC2
+PC_ir_arr = np.full((nT, nP, nI, nR), PC_MID)  # TC2
 
 # PC_jr: Costo de adquisición desde centros locales (TC2) [IDR/unidad]
-PC_jr = {(t, p, j, r): central_int(PC_MIN, PC_MAX) for t in T for p in P for j in J for r in R}  # TC2
+PC_jr_arr = np.full((nT, nP, nJ, nR), PC_MID)  # TC2
 
 # ----------------------------
 # COSTOS DE INVENTARIO (TC4)
 # ----------------------------
 # IC_r: Costo de mantener inventario en bancos regionales [IDR/unidad/período]
-IC_r = {(t, p, r): central_int(IC_MIN, IC_MAX) for t in T for p in P for r in R}
+IC_r_arr = np.full((nT, nP, nR), IC_MID)
 
 # IC_h: Costo de mantener inventario en hospitales
-IC_h = {(t, p, h): central_int(IC_MIN, IC_MAX) for t in T for p in P for h in H}
+IC_h_arr = np.full((nT, nP, nH), IC_MID)
 
 # IC_k: Costo de mantener inventario en clínicas
-IC_k = {(t, p, k): central_int(IC_MIN, IC_MAX) for t in T for p in P for k in K}
+IC_k_arr = np.full((nT, nP, nK), IC_MID)
 
 # ----------------------------
 # COSTOS DE OBSOLESCENCIA (TC5)
 # ----------------------------
 # WC_r: Costo de manejo de sangre obsoleta en bancos regionales [IDR/unidad]
-WC_r = {(t, p, r): central_int(WC_MIN, WC_MAX) for t in T for p in P for r in R}
+WC_r_arr = np.full((nT, nP, nR), WC_MID)
 
 # WC_h: Costo de manejo de sangre obsoleta en hospitales
-WC_h = {(t, p, h): central_int(WC_MIN, WC_MAX) for t in T for p in P for h in H}
+WC_h_arr = np.full((nT, nP, nH), WC_MID)
 
 # WC_k: Costo de manejo de sangre obsoleta en clínicas
-WC_k = {(t, p, k): central_int(WC_MIN, WC_MAX) for t in T for p in P for k in K}
+WC_k_arr = np.full((nT, nP, nK), WC_MID)
 
 # ----------------------------
 # COSTOS DE TRANSPORTE (TC6)
 # ----------------------------
 # XC_*: Costos de transporte para cada ruta [IDR/unidad/km]
 # El costo total de transporte se calcula como: XC * flujo * distancia
-
-XC_ir = {(t, p, i, r): central_int(XC_MIN, XC_MAX) for t in T for p in P for i in I for r in R}
-XC_jr = {(t, p, j, r): central_int(XC_MIN, XC_MAX) for t in T for p in P for j in J for r in R}
-XC_jh = {(t, p, j, h): central_int(XC_MIN, XC_MAX) for t in T for p in P for j in J for h in H}
-XC_jk = {(t, p, j, k): central_int(XC_MIN, XC_MAX) for t in T for p in P for j in J for k in K}
-XC_rh = {(t, p, r, h): central_int(XC_MIN, XC_MAX) for t in T for p in P for r in R for h in H}
-XC_rk = {(t, p, r, k): central_int(XC_MIN, XC_MAX) for t in T for p in P for r in R for k in K}
-XC_rr = {(t, p, r1, r2): central_int(XC_MIN, XC_MAX) for t in T for p in P for r1 in R for r2 in R if r1 != r2}
-XC_ru = {(t, p, r, u): central_int(XC_MIN, XC_MAX) for t in T for p in P for r in R for u in U}
-XC_hu = {(t, p, h, u): central_int(XC_MIN, XC_MAX) for t in T for p in P for h in H for u in U}
-XC_ku = {(t, p, k, u): central_int(XC_MIN, XC_MAX) for t in T for p in P for k in K for u in U}
+# (en XC_rr la diagonal r1 == r2 no se usa)
+
+XC_ir_arr = np.full((nT, nP, nI, nR), XC_MID)
+XC_jr_arr = np.full((nT, nP, nJ, nR), XC_MID)
+XC_jh_arr = np.full((nT, nP, nJ, nH), XC_MID)
+XC_jk_arr = np.full((nT, nP, nJ, nK), XC_MID)
+XC_rh_arr = np.full((nT, nP, nR, nH), XC_MID)
+XC_rk_arr = np.full((nT, nP, nR, nK), XC_MID)
+XC_rr_arr = np.full((nT, nP, nR, nR), XC_MID)
+XC_ru_arr = np.full((nT, nP, nR, nU), XC_MID)
+XC_hu_arr = np.full((nT, nP, nH, nU), XC_MID)
+XC_ku_arr = np.full((nT, nP, nK, nU), XC_MID)
+
+# CD_*: Costo de transporte por unidad en cada ruta (XC * distancia) [IDR/unidad]
+# Se precalcula por difusión (broadcasting) de las distancias sobre (tiempo, producto),
+# de modo que TC6 usa un solo coeficiente por flujo
+CD_ir_arr = XC_ir_arr * d_ir_arr[None, None, :, :]
+CD_jr_arr = XC_jr_arr * d_jr_arr[None, None, :, :]
+CD_jh_arr = XC_jh_arr * d_jh_arr[None, None, :, :]
+CD_jk_arr = XC_jk_arr * d_jk_arr[None, None, :, :]
+CD_rh_arr = XC_rh_arr * d_rh_arr[None, None, :, :]
+CD_rk_arr = XC_rk_arr * d_rk_arr[None, None, :, :]
+CD_rr_arr = XC_rr_arr * d_rr_arr[None, None, :, :]
+CD_ru_arr = XC_ru_arr * d_ru_arr[None, None, :, :]
+CD_hu_arr = XC_hu_arr * d_hu_arr[None, None, :, :]
+CD_ku_arr = XC_ku_arr * d_ku_arr[None, None, :, :]
 
 # ----------------------------
 # CAPACIDADES DE INSTALACIONES
 # ----------------------------
 # CAP_BM: Capacidad de procesamiento de bancos móviles [unidades/período]
-CAP_BM = {(t, p, i): central_int(50, 150) for t in T for p in P for i in I}
+CAP_BM_arr = np.full((nT, nP, nI), central_int(50, 150))
 
 # CAP_LBDC: Capacidad de procesamiento de centros de distribución locales [unidades/período]
-CAP_LBDC = {(t, p, j): central_int(100, 200) for t in T for p in P for j in J}
+CAP_LBDC_arr = np.full((nT, nP, nJ), central_int(100, 200))
+
 
 # ===========================
 # FUNCIÓN PARA CREAR EL MODELO BASE
@@ -413,6 +496,106 @@ CAP_LBDC = {(t, p, j): central_int(100, 200) for t in T for p in P for j in J}
 # - Conjuntos: Entidades de la cadena de suministro
 # - Variables: Decisiones de producción, inventario, transporte
 # - Restricciones: Reglas que el modelo debe cumplir
+#
+# Las expresiones lineales se arman como LinearExpression a partir de listas de
+# coeficientes y variables, o con quicksum para sumas simples de variables, en
+# lugar de encadenar sum() (que crea un objeto de expresión intermedio por cada
+# término sumado)
+#
+# Los parámetros no se traducen a diccionarios indexados por etiquetas: los
+# coeficientes del objetivo, del límite de carbono y del reporte se usan
+# directamente como arreglos (junto con m.vars_planas), y las capacidades y los
+# Param mutables (m.DM_h, m.DM_k, m.EP, m.CAP) se leen de sus arreglos con los
+# índices POS_*
+
+def expresion_lineal(terminos, constante=0):
+    """Construye constante + sum(c * x) como una única LinearExpression
+    
+    Args:
+        terminos: Lista de pares (coeficiente, variable)
+        constante: Término independiente de la expresión
+    Returns:
+        LinearExpression con los coeficientes y variables en el orden recibido
+    """
+    return LinearExpression(constant=constante,
+                            linear_coefs=[c for c, _ in terminos],
+                            linear_vars=[x for _, x in terminos])
+
+def variables_planas(var, *conjuntos):
+    """Materializa una vez los elementos de un componente indexado en un arreglo NumPy
+    
+    El arreglo (de objetos) tiene un eje por conjunto y sigue el mismo orden (C) que
+    los arreglos de parámetros *_arr, de modo que coeficientes y variables se
+    recorren en paralelo sin volver a indexar el componente de Pyomo.
+    
+    Args:
+        var: Componente indexado (Var, o Param mutable)
+        conjuntos: Conjuntos (listas) de índices en el orden de declaración de var
+    Returns:
+        Arreglo NumPy de objetos con las variables (o parámetros)
+    """
+    forma = tuple(len(c) for c in conjuntos)
+    return np.fromiter((var[idx] for idx in product(*conjuntos)),
+                       dtype=object, count=int(np.prod(forma))).reshape(forma)
+
+def terminos_planos(coefs, variables):
+    """Recorre coeficientes y variables materializadas en orden C, sin términos nulos
+    
+    Los coeficientes numéricos iguales a cero se descartan antes de llegar a la
+    expresión (no aportan nada y solo agrandan la fila o el objetivo).
+    
+    Args:
+        coefs: Escalar o arreglo NumPy con la forma de variables, o lista plana;
+            los coeficientes con parámetros mutables (lista o arreglo de objetos)
+            se usan todos
+        variables: Arreglo de objetos devuelto por variables_planas
+    Returns:
+        Tupla (lista de coeficientes, lista de variables) del mismo largo
+    """
+    if isinstance(coefs, list):
+        return coefs, variables.ravel().tolist()
+    coefs = np.broadcast_to(coefs, variables.shape).ravel()
+    variables = variables.ravel()
+    if coefs.dtype == object:
+        return coefs.tolist(), variables.tolist()
+    no_nulos = np.flatnonzero(coefs)
+    if no_nulos.size < coefs.size:
+        coefs, variables = coefs[no_nulos], variables[no_nulos]
+    return coefs.tolist(), variables.tolist()
+
+def pares_planos(coefs, variables):
+    """Empareja coeficientes con variables materializadas (ver terminos_planos)
+    
+    Args:
+        coefs: Escalar, arreglo NumPy o lista plana de coeficientes
+        variables: Arreglo de objetos devuelto por variables_planas
+    Returns:
+        Lista de pares (coeficiente, variable) para expresion_lineal
+    """
+    return list(zip(*terminos_planos(coefs, variables)))
+
+def valores_planos(variables):
+    """Extrae los valores de la solución de un arreglo de variables materializadas
+    
+    Args:
+        variables: Arreglo de objetos devuelto por variables_planas
+    Returns:
+        Arreglo NumPy float64 con la misma forma, listo para operar con los *_arr
+    """
+    return np.fromiter((x.value for x in variables.ravel()), dtype=np.float64,
+                       count=variables.size).reshape(variables.shape)
+
+def suma_lineal(positivas, negativas=(), constante=0):
+    """Construye constante + sum(positivas) - sum(negativas) como LinearExpression
+    
+    Args:
+        positivas: Lista de variables con coeficiente +1
+        negativas: Lista de variables con coeficiente -1
+        constante: Término independiente de la expresión
+    Returns:
+        LinearExpression de la suma (p. ej. entradas - salidas de un balance)
+    """
+    return expresion_lineal([(1, x) for x in positivas] + [(-1, x) for x in negativas], constante)
 
 def crear_modelo_base():
     """Crea y retorna un modelo ConcreteModel de Pyomo con todas las variables y restricciones."""
@@ -433,6 +616,27 @@ def crear_modelo_base():
         Set(initialize=P),  # Tipos de Sangre
         Set(initialize=T)   # Períodos de Tiempo
     )
+    # Pares de bancos regionales distintos (transferencias XD_rr)
+    m.RR_valid = Set(initialize=RR_pairs, dimen=2)
+    # Períodos posteriores a la vida útil (restricciones FIFO)
+    m.T_post_alpha = Set(initialize=T_post_alpha, within=m.T)
+    
+    # ----------------------------
+    # PARÁMETROS MUTABLES (CALIBRACIÓN)
+    # ----------------------------
+    # La demanda, las emisiones de producción y el límite de carbono se declaran
+    # como Param mutables para poder recalibrarlos (p. ej. demanda 12->13) y volver
+    # a resolver sin reconstruir el modelo (ver resolver_con_arranque_en_caliente)
+    m.DM_h = Param(m.T, m.P, m.H, mutable=True,
+                   initialize=lambda m, t, p, h: DM_h_arr[POS_T[t], POS_P[p], POS_H[h]].item())
+    m.DM_k = Param(m.T, m.P, m.K, mutable=True,
+                   initialize=lambda m, t, p, k: DM_k_arr[POS_T[t], POS_P[p], POS_K[k]].item())
+    m.EP = Param(m.T, m.P, m.R, mutable=True,
+                 initialize=lambda m, t, p, r: EP_arr[POS_T[t], POS_P[p], POS_R[r]].item())
+    m.CAP = Param(m.T, mutable=True, initialize=lambda m, t: CAP_arr[POS_T[t]].item())
+    # Demandas totales del horizonte (denominadores de TSH y TSK en el objetivo)
+    m.demanda_total_h = Param(initialize=DEMANDA_TOTAL_H, mutable=True)
+    m.demanda_total_k = Param(initialize=DEMANDA_TOTAL_K, mutable=True)
     
     # ----------------------------
     # VARIABLES DE DECISIÓN: FLUJOS DE TRANSPORTE
@@ -460,7 +664,8 @@ def crear_modelo_base():
     m.XD_rk = Var(m.T, m.P, m.R, m.K, domain=NonNegativeReals)
     
     # XD_rr: Flujo entre Bancos Regionales (R a R) para redistribución
-    m.XD_rr = Var(m.T, m.P, m.R, m.R, domain=NonNegativeReals)
+    # Solo se declara para pares distintos (r1 != r2): no hay transferencias de un banco a sí mismo
+    m.XD_rr = Var(m.T, m.P, m.RR_valid, domain=NonNegativeReals)
     
     # XD_ru: Flujo de Bancos Regionales (R) a Centros de Residuos (U) - sangre obsoleta
     m.XD_ru = Var(m.T, m.P, m.R, m.U, domain=NonNegativeReals)
@@ -474,17 +679,26 @@ def crear_modelo_base():
     # ----------------------------
     # VARIABLES DE DECISIÓN: PRODUCCIÓN E INVENTARIO
     # ----------------------------
+    # Las capacidades de producción y de almacenamiento (restricción 4) se imponen
+    # como cotas superiores de estas variables y no como filas de la matriz
+    
     # PR: Cantidad producida en los Bancos Regionales por (tiempo, producto, banco)
-    m.PR = Var(m.T, m.P, m.R, domain=NonNegativeReals)
+    # Producción no puede exceder capacidad disponible
+    m.PR = Var(m.T, m.P, m.R, domain=NonNegativeReals,
+               bounds=lambda m, t, p, r: (0, PA_arr[POS_T[t], POS_P[p], POS_R[r]].item()))
     
     # IR: Inventario en Bancos Regionales al final del período (tiempo, producto, banco)
-    m.IR = Var(m.T, m.P, m.R, domain=NonNegativeReals)
+    # Inventario no puede exceder capacidad de almacenamiento
+    m.IR = Var(m.T, m.P, m.R, domain=NonNegativeReals,
+               bounds=lambda m, t, p, r: (0, SC_r_arr[POS_P[p], POS_R[r]].item()))
     
     # IH: Inventario en Hospitales al final del período (tiempo, producto, hospital)
-    m.IH = Var(m.T, m.P, m.H, domain=NonNegativeReals)
+    m.IH = Var(m.T, m.P, m.H, domain=NonNegativeReals,
+               bounds=lambda m, t, p, h: (0, SC_h_arr[POS_P[p], POS_H[h]].item()))
     
     # IK: Inventario en Clínicas al final del período (tiempo, producto, clínica)
-    m.IK = Var(m.T, m.P, m.K, domain=NonNegativeReals)
+    m.IK = Var(m.T, m.P, m.K, domain=NonNegativeReals,
+               bounds=lambda m, t, p, k: (0, SC_k_arr[POS_P[p], POS_K[k]].item()))
     
     # ----------------------------
     # VARIABLES DE DECISIÓN: OBSOLESCENCIA (WASTE)
@@ -499,29 +713,62 @@ def crear_modelo_base():
     m.WO_k = Var(m.T, m.P, m.K, domain=NonNegativeReals)
     
     # ----------------------------
-    # VARIABLES BINARIAS: ACTIVACIÓN DE INSTALACIONES
+    # VARIABLES DE ACTIVACIÓN DE INSTALACIONES
     # ----------------------------
     # Estas variables deciden si una instalación opera en un período dado
     # 1 = instalación activa, 0 = inactiva
+    # Se declaran en [0, 1] en lugar de Binary: solo aparecen en la restricción 8
+    # (una fila sum_t y[t] >= 1 por instalación) y en el costo fijo TC1, sin enlace
+    # con los flujos. Esas filas son totalmente unimodulares, así que los vértices
+    # del LP (la solución que devuelve el simplex) ya son 0/1 y el modelo se
+    # resuelve como LP, sin ramificación y acotamiento
     
     # y_i: Activación de Bancos Móviles por (tiempo, banco móvil)
-    m.y_i = Var(m.T, m.I, domain=Binary)
+    m.y_i = Var(m.T, m.I, domain=UnitInterval)
     
     # y_j: Activación de Centros de Distribución Local por (tiempo, centro)
-    m.y_j = Var(m.T, m.J, domain=Binary)
+    m.y_j = Var(m.T, m.J, domain=UnitInterval)
     
     # y_r: Activación de Bancos Regionales por (tiempo, banco)
-    m.y_r = Var(m.T, m.R, domain=Binary)
+    m.y_r = Var(m.T, m.R, domain=UnitInterval)
     
     # ----------------------------
-    # INICIALIZACIÓN DE LISTA DE RESTRICCIONES
+    # VISTA PLANA DE LAS VARIABLES (SoA)
     # ----------------------------
-    # ConstraintList permite agregar restricciones dinámicamente
-    m.restricciones = ConstraintList()
+    # Cada componente se materializa una sola vez como arreglo de objetos alineado
+    # con los arreglos de parámetros; las restricciones y el objetivo toman sus
+    # términos de estos arreglos en lugar de indexar m.XD_*[t, p, o, d] en cada término
+    m.vars_planas = {
+        'XD_ir': variables_planas(m.XD_ir, T, P, I, R),
+        'XD_jr': variables_planas(m.XD_jr, T, P, J, R),
+        'XD_jh': variables_planas(m.XD_jh, T, P, J, H),
+        'XD_jk': variables_planas(m.XD_jk, T, P, J, K),
+        'XD_rh': variables_planas(m.XD_rh, T, P, R, H),
+        'XD_rk': variables_planas(m.XD_rk, T, P, R, K),
+        'XD_rr': variables_planas(m.XD_rr, T, P, RR_pairs),
+        'XD_ru': variables_planas(m.XD_ru, T, P, R, U),
+        'XD_hu': variables_planas(m.XD_hu, T, P, H, U),
+        'XD_ku': variables_planas(m.XD_ku, T, P, K, U),
+        'PR': variables_planas(m.PR, T, P, R),
+        'IR': variables_planas(m.IR, T, P, R),
+        'IH': variables_planas(m.IH, T, P, H),
+        'IK': variables_planas(m.IK, T, P, K),
+        'WO_r': variables_planas(m.WO_r, T, P, R),
+        'WO_h': variables_planas(m.WO_h, T, P, H),
+        'WO_k': variables_planas(m.WO_k, T, P, K),
+        'y_i': variables_planas(m.y_i, T, I),
+        'y_j': variables_planas(m.y_j, T, J),
+    }
     
     # ===========================
     # RESTRICCIONES DEL MODELO
     # ===========================
+    # Cada bloque es un Constraint indexado con su propia regla (m.balance_r,
+    # m.limite_carbono, ...): Pyomo crea las filas de una vez sobre el índice del
+    # bloque y cada familia queda identificada por nombre en el modelo.
+    # Las reglas toman los términos de m.vars_planas por posición (POS_*) en lugar
+    # de indexar m.XD_*[t, p, o, d] término a término
+    V = m.vars_planas
     
     # ----------------------------
     # RESTRICCIÓN 1: BALANCE DE INVENTARIO EN BANCOS REGIONALES (RBB)
@@ -529,36 +776,44 @@ def crear_modelo_base():
     # Ecuación de balance: Inventario anterior + Entradas = Inventario actual + Salidas
     # Esta restricción asegura la conservación de masa en cada banco regional
     
-    for t in T:
-        for p in P:
-            for r in R:
-                # Inventario del período anterior (0 si es el primer período)
-                IR_prev = 0 if t == 1 else m.IR[t-1, p, r]
-                
-                # ENTRADAS al banco regional:
-                # 1. Producción propia del banco
-                # 2. Recepción de bancos móviles (I)
-                # 3. Recepción de centros locales (J)
-                # 4. Transferencias de otros bancos regionales
-                inflows = (m.PR[t, p, r] +
-                          sum(m.XD_ir[t, p, i, r] for i in I) +
-                          sum(m.XD_jr[t, p, j, r] for j in J) +
-                          sum(m.XD_rr[t, p, r2, r] for r2 in R if r2 != r))
-                
-                # SALIDAS del banco regional:
-                # 1. Envíos a hospitales
-                # 2. Envíos a clínicas
-                # 3. Transferencias a otros bancos regionales
-                # 4. Envíos a centros de residuos (obsoletos)
-                # 5. Obsolescencia in-situ
-                outflows = (sum(m.XD_rh[t, p, r, h] for h in H) +
-                           sum(m.XD_rk[t, p, r, k] for k in K) +
-                           sum(m.XD_rr[t, p, r, r2] for r2 in R if r2 != r) +
-                           sum(m.XD_ru[t, p, r, u] for u in U) +
-                           m.WO_r[t, p, r])
-                
-                # Ecuación de balance: Inv_anterior + Entradas = Inv_actual + Salidas
-                m.restricciones.add(IR_prev + inflows == m.IR[t, p, r] + outflows)
+    def regla_balance_r(m, t, p, r):
+        it, ip, ir = POS_T[t], POS_P[p], POS_R[r]
+        # ENTRADAS al banco regional:
+        # 1. Producción propia del banco
+        # 2. Recepción de bancos móviles (I)
+        # 3. Recepción de centros locales (J)
+        # 4. Transferencias de otros bancos regionales
+        inflows = ([V['PR'][it, ip, ir]] +
+                   V['XD_ir'][it, ip, :, ir].tolist() +
+                   V['XD_jr'][it, ip, :, ir].tolist() +
+                   V['XD_rr'][it, ip, RR_entrantes[r]].tolist())
+        # Inventario del período anterior (no existe en el primer período)
+        if t > 1:
+            inflows.append(V['IR'][it-1, ip, ir])
+        
+        # SALIDAS del banco regional:
+        # 1. Envíos a hospitales
+        # 2. Envíos a clínicas
+        # 3. Transferencias a otros bancos regionales
+        # 4. Envíos a centros de residuos (obsoletos)
+        # 5. Obsolescencia in-situ
+        # 6. Inventario al final del período
+        outflows = (V['XD_rh'][it, ip, ir].tolist() +
+                    V['XD_rk'][it, ip, ir].tolist() +
+                    V['XD_rr'][it, ip, RR_salientes[r]].tolist() +
+                    V['XD_ru'][it, ip, ir].tolist() +
+                    [V['WO_r'][it, ip, ir], V['IR'][it, ip, ir]])
+        
+        # Ecuación de balance: Inv_anterior + Entradas - Inv_actual - Salidas = 0
+        return suma_lineal(inflows, outflows) == 0
+    
+    m.balance_r = Constraint(m.T, m.P, m.R, rule=regla_balance_r)
+    
+    # Entradas a cada hospital y clínica: desde centros locales (J) y bancos regionales
+    # (R), concatenadas en el eje de origen, con forma (tiempo, producto, origen, nodo).
+    # Las comparten el balance (restricciones 2 y 3) y el límite de suministro (restricción 6)
+    entradas_h = np.concatenate((V['XD_jh'], V['XD_rh']), axis=2)
+    entradas_k = np.concatenate((V['XD_jk'], V['XD_rk']), axis=2)
     
     # ----------------------------
     # RESTRICCIÓN 2: BALANCE DE INVENTARIO EN HOSPITALES (H)
@@ -567,31 +822,27 @@ def crear_modelo_base():
     # Solo reciben de centros locales (J) y bancos regionales (R)
     # La demanda de pacientes se satisface del inventario
     
-    for t in T:
-        for p in P:
-            for h in H:
-                # Inventario del período anterior (0 si es el primer período)
-                IH_prev = 0 if t == 1 else m.IH[t-1, p, h]
-                
-                # ENTRADAS al hospital desde:
-                # 1. Centros de distribución local (J)
-                # 2. Bancos regionales (R)
-                inflows = (sum(m.XD_jh[t, p, j, h] for j in J) +
-                          sum(m.XD_rh[t, p, r, h] for r in R))
-                
-                # Demanda de sangre del hospital en este período
-                demanda = DM_h[t, p, h]
-                
-                # SALIDAS del hospital:
-                # 1. Demanda satisfecha a pacientes
-                # 2. Envíos a centros de residuos (obsoleta)
-                # 3. Obsolescencia in-situ
-                outflows = (demanda +
-                           sum(m.XD_hu[t, p, h, u] for u in U) +
-                           m.WO_h[t, p, h])
-                
-                # Ecuación de balance para hospitales
-                m.restricciones.add(IH_prev + inflows == m.IH[t, p, h] + outflows)
+    def regla_balance_h(m, t, p, h):
+        it, ip, ih = POS_T[t], POS_P[p], POS_H[h]
+        # ENTRADAS al hospital desde:
+        # 1. Centros de distribución local (J)
+        # 2. Bancos regionales (R)
+        inflows = entradas_h[it, ip, :, ih].tolist()
+        # Inventario del período anterior (no existe en el primer período)
+        if t > 1:
+            inflows.append(V['IH'][it-1, ip, ih])
+        
+        # SALIDAS del hospital:
+        # 1. Envíos a centros de residuos (obsoleta)
+        # 2. Obsolescencia in-situ
+        # 3. Inventario al final del período
+        outflows = (V['XD_hu'][it, ip, ih].tolist() +
+                    [V['WO_h'][it, ip, ih], V['IH'][it, ip, ih]])
+        
+        # La demanda de pacientes del período entra como término constante
+        return suma_lineal(inflows, outflows, -m.DM_h[t, p, h]) == 0
+    
+    m.balance_h = Constraint(m.T, m.P, m.H, rule=regla_balance_h)
     
     # ----------------------------
     # RESTRICCIÓN 3: BALANCE DE INVENTARIO EN CLÍNICAS (K)
@@ -599,62 +850,50 @@ def crear_modelo_base():
     # Análogo al balance de hospitales
     # Las clínicas reciben de centros locales (J) y bancos regionales (R)
     
-    for t in T:
-        for p in P:
-            for k in K:
-                # Inventario del período anterior (0 si es el primer período)
-                IK_prev = 0 if t == 1 else m.IK[t-1, p, k]
-                
-                # ENTRADAS a la clínica desde:
-                # 1. Centros de distribución local (J)
-                # 2. Bancos regionales (R)
-                inflows = (sum(m.XD_jk[t, p, j, k] for j in J) +
-                          sum(m.XD_rk[t, p, r, k] for r in R))
-                
-                # Demanda de sangre de la clínica en este período
-                demanda = DM_k[t, p, k]
-                
-                # SALIDAS de la clínica:
-                # 1. Demanda satisfecha a pacientes
-                # 2. Envíos a centros de residuos (obsoleta)
-                # 3. Obsolescencia in-situ
-                outflows = (demanda +
-                           sum(m.XD_ku[t, p, k, u] for u in U) +
-                           m.WO_k[t, p, k])
-                
-                # Ecuación de balance para clínicas
-                m.restricciones.add(IK_prev + inflows == m.IK[t, p, k] + outflows)
+    def regla_balance_k(m, t, p, k):
+        it, ip, ik = POS_T[t], POS_P[p], POS_K[k]
+        # ENTRADAS a la clínica desde:
+        # 1. Centros de distribución local (J)
+        # 2. Bancos regionales (R)
+        inflows = entradas_k[it, ip, :, ik].tolist()
+        # Inventario del período anterior (no existe en el primer período)
+        if t > 1:
+            inflows.append(V['IK'][it-1, ip, ik])
+        
+        # SALIDAS de la clínica:
+        # 1. Envíos a centros de residuos (obsoleta)
+        # 2. Obsolescencia in-situ
+        # 3. Inventario al final del período
+        outflows = (V['XD_ku'][it, ip, ik].tolist() +
+                    [V['WO_k'][it, ip, ik], V['IK'][it, ip, ik]])
+        
+        # La demanda de pacientes del período entra como término constante
+        return suma_lineal(inflows, outflows, -m.DM_k[t, p, k]) == 0
+    
+    m.balance_k = Constraint(m.T, m.P, m.K, rule=regla_balance_k)
     
     # ----------------------------
     # RESTRICCIÓN 4: CAPACIDADES DE PRODUCCIÓN E INVENTARIO
     # ----------------------------
     # Estas restricciones limitan según las capacidades disponibles
+    # (producción e inventarios: cotas de PR, IR, IH e IK en su declaración)
+    
+    # Límite de procesamiento de bancos móviles
+    def regla_cap_bm(m, t, p, i):
+        it, ip, ii = POS_T[t], POS_P[p], POS_I[i]
+        return suma_lineal(V['XD_ir'][it, ip, ii].tolist()) <= CAP_BM_arr[it, ip, ii]
     
-    for t in T:
-        for p in P:
-            # Límite de producción e inventario en bancos regionales
-            for r in R:
-                # Producción no puede exceder capacidad disponible
-                m.restricciones.add(m.PR[t, p, r] <= PA[t, p, r])
-                # Inventario no puede exceder capacidad de almacenamiento
-                m.restricciones.add(m.IR[t, p, r] <= SC_r[p, r])
-            
-            # Límite de procesamiento de bancos móviles
-            for i in I:
-                m.restricciones.add(sum(m.XD_ir[t, p, i, r] for r in R) <= CAP_BM[t, p, i])
-            
-            # Límite de procesamiento de centros de distribución local
-            for j in J:
-                total_lbdc = (sum(m.XD_jr[t, p, j, r] for r in R) +
-                             sum(m.XD_jh[t, p, j, h] for h in H) +
-                             sum(m.XD_jk[t, p, j, k] for k in K))
-                m.restricciones.add(total_lbdc <=CAP_LBDC[t, p, j])
-            
-            # Límite de almacenamiento en hospitales y clínicas
-            for h in H:
-                m.restricciones.add(m.IH[t, p, h] <= SC_h[p, h])
-            for k in K:
-                m.restricciones.add(m.IK[t, p, k] <= SC_k[p, k])
+    m.cap_bm = Constraint(m.T, m.P, m.I, rule=regla_cap_bm)
+    
+    # Límite de procesamiento de centros de distribución local
+    def regla_cap_lbdc(m, t, p, j):
+        it, ip, ij = POS_T[t], POS_P[p], POS_J[j]
+        total_lbdc = (V['XD_jr'][it, ip, ij].tolist() +
+                      V['XD_jh'][it, ip, ij].tolist() +
+                      V['XD_jk'][it, ip, ij].tolist())
+        return suma_lineal(total_lbdc) <= CAP_LBDC_arr[it, ip, ij]
+    
+    m.cap_lbdc = Constraint(m.T, m.P, m.J, rule=regla_cap_lbdc)
     
     # ----------------------------
     # RESTRICCIÓN 5: LÍMITE AMBIENTAL - CARBON CAP (Ecuación 34) - CRÍTICA
@@ -662,28 +901,36 @@ def crear_modelo_base():
     # Limita emisiones totales por período a CAP_t = 1000 kg CO2e
     # Emisiones = producción + almacenamiento + transporte
     
-    for t in T:
+    # Los coeficientes del período t son la rebanada [t] de los arreglos de emisiones
+    # (eje 0 = tiempo), alineada con la rebanada [t] de m.vars_planas; EP es mutable,
+    # así que se materializan sus parámetros en el mismo orden
+    EP_plano = variables_planas(m.EP, T, P, R)
+    
+    def regla_limite_carbono(m, t):
+        it = POS_T[t]
         # 1. EMISIONES DE PRODUCCIÓN (TEP_t)
-        emision_prod_t = sum(EP[t, p, r] * m.PR[t, p, r] for p in P for r in R)
+        emision_prod_t = pares_planos(EP_plano[it], V['PR'][it])
         
         # 2. EMISIONES DE ALMACENAMIENTO (TES_t)
-        emision_inv_t = (sum(EI_r[t, p, r] * m.IR[t, p, r] for p in P for r in R) +
-                         sum(EI_h[t, p, h] * m.IH[t, p, h] for p in P for h in H) +
-                         sum(EI_k[t, p, k] * m.IK[t, p, k] for p in P for k in K))
+        emision_inv_t = (pares_planos(EI_r_arr[it], V['IR'][it]) +
+                         pares_planos(EI_h_arr[it], V['IH'][it]) +
+                         pares_planos(EI_k_arr[it], V['IK'][it]))
         
-        # 3. EMISIONES DE TRANSPORTE (TED_t) - Todas las rutas
+        # 3. EMISIONES DE TRANSPORTE (TED_t) - Todas las rutas (rr: solo pares r1 != r2)
         emision_transp_t = (
-            sum(EX_ir[t, p, i, r] * m.XD_ir[t, p, i, r] * d_ir[i, r] for p in P for i in I for r in R) +
-            sum(EX_jr[t, p, j, r] * m.XD_jr[t, p, j, r] * d_jr[j, r] for p in P for j in J for r in R) +
-            sum(EX_jh[t, p, j, h] * m.XD_jh[t, p, j, h] * d_jh[j, h] for p in P for j in J for h in H) +
-            sum(EX_jk[t, p, j, k] * m.XD_jk[t, p, j, k] * d_jk[j, k] for p in P for j in J for k in K) +
-            sum(EX_rh[t, p, r, h] * m.XD_rh[t, p, r, h] * d_rh[r, h] for p in P for r in R for h in H) +
-            sum(EX_rk[t, p, r, k] * m.XD_rk[t, p, r, k] * d_rk[r, k] for p in P for r in R for k in K) +
-            sum(EX_rr[t, p, r1, r2] * m.XD_rr[t, p, r1, r2] * d_rr[r1, r2] for p in P for r1 in R for r2 in R if r1 != r2)
+            pares_planos(EXD_ir_arr[it], V['XD_ir'][it]) +
+            pares_planos(EXD_jr_arr[it], V['XD_jr'][it]) +
+            pares_planos(EXD_jh_arr[it], V['XD_jh'][it]) +
+            pares_planos(EXD_jk_arr[it], V['XD_jk'][it]) +
+            pares_planos(EXD_rh_arr[it], V['XD_rh'][it]) +
+            pares_planos(EXD_rk_arr[it], V['XD_rk'][it]) +
+            pares_planos(EXD_rr_arr[it][:, RR_pos[0], RR_pos[1]], V['XD_rr'][it])
         )
         
         # Restricción: Emisiones totales <= Límite de carbono
-        m.restricciones.add(emision_prod_t + emision_inv_t + emision_transp_t <= CAP[t])
+        return expresion_lineal(emision_prod_t + emision_inv_t + emision_transp_t) <= m.CAP[t]
+    
+    m.limite_carbono = Constraint(m.T, rule=regla_limite_carbono)
     
     # ----------------------------
     # RESTRICCIÓN 6: LÍMITES DE SUMINISTRO (Evita sobre-producción masiva)
@@ -691,19 +938,17 @@ def crear_modelo_base():
     # Hospitales: máximo 1.1x demanda (10% exceso → objetivo ~109%)
     # Clínicas: máximo 1.6x demanda (60% exceso → objetivo ~155%)
     
-    for t in T:
-        for p in P:
-            # Límite de suministro para hospitales
-            for h in H:
-                suministro_h_tp = (sum(m.XD_jh[t, p, j, h] for j in J) +
-                                  sum(m.XD_rh[t, p, r, h] for r in R))
-                m.restricciones.add(suministro_h_tp <= 1.1 * DM_h[t, p, h])
-            
-            # Límite de suministro para clínicas
-            for k in K:
-                suministro_k_tp = (sum(m.XD_jk[t, p, j, k] for j in J) +
-                                  sum(m.XD_rk[t, p, r, k] for r in R))
-                m.restricciones.add(suministro_k_tp <= 1.6 * DM_k[t, p, k])
+    # Límite de suministro para hospitales
+    def regla_suministro_h(m, t, p, h):
+        return suma_lineal(entradas_h[POS_T[t], POS_P[p], :, POS_H[h]].tolist()) <= 1.1 * m.DM_h[t, p, h]
+    
+    m.suministro_h = Constraint(m.T, m.P, m.H, rule=regla_suministro_h)
+    
+    # Límite de suministro para clínicas
+    def regla_suministro_k(m, t, p, k):
+        return suma_lineal(entradas_k[POS_T[t], POS_P[p], :, POS_K[k]].tolist()) <= 1.6 * m.DM_k[t, p, k]
+    
+    m.suministro_k = Constraint(m.T, m.P, m.K, rule=regla_suministro_k)
     
     # ----------------------------
     # RESTRICCIÓN 7: VIDA ÚTIL DE LA SANGRE (FIFO - First In, First Out)
@@ -711,23 +956,20 @@ def crear_modelo_base():
     # La sangre tiene una vida útil de ALPHA períodos (25 días)
     # La sangre obsoleta en el período t debe corresponder a inventario del período t-ALPHA
     # Esto implementa la política FIFO: lo primero que entra es lo primero que sale/caduca
+    # Solo se aplica después de ALPHA períodos (cuando ya hay inventario envejecido),
+    # por eso las restricciones se indexan sobre m.T_post_alpha
+    
+    # Obsolescencia en bancos regionales: obsoleto en t <= inventario de hace ALPHA períodos
+    m.fifo_r = Constraint(m.T_post_alpha, m.P, m.R,
+                          rule=lambda m, t, p, r: m.WO_r[t, p, r] <= m.IR[t-ALPHA, p, r])
     
-    for t in T:
-        # Solo se aplica después de ALPHA períodos (cuando ya hay inventario envejecido)
-        if t > ALPHA:
-            for p in P:
-                # Obsolescencia en bancos regionales
-                for r in R:
-                    # Obsoleto en t <= Inventario que había hace ALPHA períodos
-                    m.restricciones.add(m.WO_r[t, p, r] <= m.IR[t-ALPHA, p, r])
-                
-                # Obsolescencia en hospitales
-                for h in H:
-                    m.restricciones.add(m.WO_h[t, p, h] <= m.IH[t-ALPHA, p, h])
-                
-                # Obsolescencia en clínicas
-                for k in K:
-                    m.restricciones.add(m.WO_k[t, p, k] <= m.IK[t-ALPHA, p, k])
+    # Obsolescencia en hospitales
+    m.fifo_h = Constraint(m.T_post_alpha, m.P, m.H,
+                          rule=lambda m, t, p, h: m.WO_h[t, p, h] <= m.IH[t-ALPHA, p, h])
+    
+    # Obsolescencia en clínicas
+    m.fifo_k = Constraint(m.T_post_alpha, m.P, m.K,
+                          rule=lambda m, t, p, k: m.WO_k[t, p, k] <= m.IK[t-ALPHA, p, k])
     
     # ----------------------------
     # RESTRICCIÓN 8: ACTIVACIÓN MÍNIMA DE INSTALACIONES
@@ -736,16 +978,13 @@ def crear_modelo_base():
     # Esto asegura que todas las instalaciones contribuyan a la operación
     
     # Al menos una activación de cada banco móvil
-    for i in I:
-        m.restricciones.add(sum(m.y_i[t, i] for t in T) >= 1)
+    m.activacion_i = Constraint(m.I, rule=lambda m, i: quicksum(m.y_i[t, i] for t in T) >= 1)
     
     # Al menos una activación de cada centro de distribución local
-    for j in J:
-        m.restricciones.add(sum(m.y_j[t, j] for t in T) >= 1)
+    m.activacion_j = Constraint(m.J, rule=lambda m, j: quicksum(m.y_j[t, j] for t in T) >= 1)
     
     # Al menos una activación de cada banco regional
-    for r in R:
-        m.restricciones.add(sum(m.y_r[t, r] for t in T) >= 1)
+    m.activacion_r = Constraint(m.R, rule=lambda m, r: quicksum(m.y_r[t, r] for t in T) >= 1)
     
     # Retornar el modelo completo con todas las variables y restricciones
     return m
@@ -770,163 +1009,384 @@ T_LS_ref = 1.3185  # Cumplimiento promedio: (109.13% + 154.57%) / 2 ≈ 131.85%
 # Valor objetivo: 203.94 kg de CO2 equivalente
 T_E_ref = 203.94  # Emisiones óptimas: 203.94 kg CO2e
 
-# Configurar el solver GLPK con ruta al ejecutable
-solver = SolverFactory('glpk', executable='/usr/bin/glpsol')
+# Configurar el solver HiGHS
+solver = appsi.solvers.Highs()
+# Mostrar la salida del solver durante la resolución
+solver.config.stream_solver = True
+# La solución se carga explícitamente solo si es óptima (ver resolver)
+solver.config.load_solution = False
+# Sin copia de los valores de las variables antes de cada solve: el modelo es un LP
+# y HiGHS conserva en memoria la base óptima anterior, que es el punto de partida
+# de los re-solves (el warmstart de appsi solo envía una solución inicial de MIP)
+solver.config.warmstart = False
+# Usar todos los núcleos disponibles en HiGHS, con el simplex dual en paralelo
+solver.highs_options = {'threads': os.cpu_count() or 1, 'parallel': 'on'}
+
+# Comprobaciones que appsi hace en cada solve para detectar cambios de estructura
+# (restricciones, variables u objetivo nuevos o modificados). En los re-solves de
+# calibración solo cambian valores de Param mutables, así que se desactivan y
+# appsi solo propaga esos valores al modelo que HiGHS mantiene en memoria
+COMPROBACIONES_ESTRUCTURALES = (
+    'check_for_new_or_removed_constraints',
+    'check_for_new_or_removed_vars',
+    'check_for_new_or_removed_params',
+    'check_for_new_objective',
+    'update_constraints',
+    'update_vars',
+    'update_named_expressions',
+    'update_objective',
+)
+
+def resolver(modelo):
+    """Resuelve el modelo con HiGHS y carga la solución en las variables si es óptima
+    
+    Args:
+        modelo: Modelo creado con crear_modelo_base() y con objetivo asignado
+    Returns:
+        Resultados de appsi (termination_condition, best_feasible_objective, ...)
+    """
+    resultados = solver.solve(modelo)
+    if resultados.termination_condition == appsi.base.TerminationCondition.optimal:
+        resultados.solution_loader.load_vars()
+    return resultados
+
+def resolver_con_arranque_en_caliente(modelo, nuevos_parametros):
+    """Vuelve a resolver un modelo ya construido tras cambiar parámetros mutables
+    
+    Pensado para barridos de calibración (demanda, factores de emisión): solo
+    cambian valores de parámetros, así que se reutiliza el modelo existente en
+    lugar de reconstruirlo. Como la interfaz de HiGHS es persistente, solo se
+    actualizan los coeficientes modificados (sin volver a revisar la estructura
+    del modelo) y el simplex parte de la base óptima anterior. Solo si la demanda
+    total de hospitales o clínicas pasa a cero (o deja de serlo) se reconstruye
+    el objetivo, con los mismos pesos.
+    
+    Args:
+        modelo: Modelo creado con crear_modelo_base() y con objetivo asignado
+        nuevos_parametros: Diccionario {nombre: valores} con los Param mutables a
+            modificar; los valores pueden ser un escalar o un diccionario por índice,
+            p. ej. {'DM_h': 12, 'DM_k': 12} o {'EP': EP_MID * 10 / 8.5, 'CAP': 800.0}
+    Returns:
+        Resultados de appsi (ver resolver)
+    """
+    for nombre, valores in nuevos_parametros.items():
+        getattr(modelo, nombre).store_values(valores)
+    # Mantener las demandas totales del objetivo consistentes con DM_h y DM_k
+    # (solo se recalculan si cambió la demanda)
+    cruza_cero = False
+    for nombre, total in (('DM_h', modelo.demanda_total_h), ('DM_k', modelo.demanda_total_k)):
+        if nombre in nuevos_parametros:
+            positiva_antes = value(total) > 0
+            total.set_value(sum(value(d) for d in getattr(modelo, nombre).values()))
+            cruza_cero |= (value(total) > 0) != positiva_antes
+    
+    # Si una demanda total pasa a cero (o deja de serlo), el término de cumplimiento
+    # del objetivo cambia de forma (coeficiente por unidad entregada o constante):
+    # se reconstruye el objetivo con los mismos pesos. appsi actualiza los Param
+    # antes de revisar el objetivo, así que el nuevo se carga en HiGHS ya aquí
+    # (el anterior dividiría por una demanda total nula)
+    if cruza_cero:
+        modelo.del_component(modelo.objetivo)
+        modelo.objetivo = Objective(
+            expr=objetivo_combinado_corregido(modelo, modelo.pesos_objetivo), sense=maximize)
+        solver.set_objective(modelo.objetivo)
+    
+    # El modelo no cambia de estructura: omitir la detección de cambios durante este solve
+    return resolver_sin_revisar_estructura(modelo)
+
+def resolver_sin_revisar_estructura(modelo, revisar=()):
+    """Resuelve omitiendo las comprobaciones estructurales de appsi durante este solve
+    
+    Args:
+        modelo: Modelo ya resuelto antes con el mismo solver
+        revisar: Comprobaciones de COMPROBACIONES_ESTRUCTURALES que se mantienen
+            activas (p. ej. las del objetivo si este se reemplazó)
+    Returns:
+        Resultados de appsi (ver resolver)
+    """
+    config_previa = {opcion: getattr(solver.update_config, opcion)
+                     for opcion in COMPROBACIONES_ESTRUCTURALES}
+    for opcion in COMPROBACIONES_ESTRUCTURALES:
+        setattr(solver.update_config, opcion, opcion in revisar)
+    try:
+        return resolver(modelo)
+    finally:
+        for opcion, valor in config_previa.items():
+            setattr(solver.update_config, opcion, valor)
 
 # ===========================
-# RESOLVER MODELO MULTI-OBJETIVO CON NORMALIZACIÓN MANUAL
+# FUNCIÓN OBJETIVO MULTI-OBJETIVO CON NORMALIZACIÓN MANUAL
 # ===========================
 
-
-modelo_final = crear_modelo_base()
-
-def objetivo_combinado_corregido(m):
-    # Beneficio
-    revenue = (sum(SP_rh[t, p, r, h] * m.XD_rh[t, p, r, h] for t in T for p in P for r in R for h in H) +
-              sum(SP_rk[t, p, r, k] * m.XD_rk[t, p, r, k] for t in T for p in P for r in R for k in K))
-    
-    TC1 = (sum(FC_BM * m.y_i[t, i] for t in T for i in I) +
-           sum(FC_LBDC * m.y_j[t, j] for t in T for j in J))
-    
-    TC2 = (sum(PC_ir[t, p, i, r] * m.XD_ir[t, p, i, r] for t in T for p in P for i in I for r in R) +
-           sum(PC_jr[t, p, j, r] * m.XD_jr[t, p, j, r] for t in T for p in P for j in J for r in R))
+def objetivo_combinado_corregido(m, pesos=None):
+    """Función objetivo combinada y normalizada (expresión para Objective)
     
-    TC3 = sum(OC[t, p, r] * m.PR[t, p, r] for t in T for p in P for r in R)
-    
-    TC4 = (sum(IC_r[t, p, r] * m.IR[t, p, r] for t in T for p in P for r in R) +
-           sum(IC_h[t, p, h] * m.IH[t, p, h] for t in T for p in P for h in H) +
-           sum(IC_k[t, p, k] * m.IK[t, p, k] for t in T for p in P for k in K))
-    
-    TC5 = (sum(WC_r[t, p, r] * m.WO_r[t, p, r] for t in T for p in P for r in R) +
-           sum(WC_h[t, p, h] * m.WO_h[t, p, h] for t in T for p in P for h in H) +
-           sum(WC_k[t, p, k] * m.WO_k[t, p, k] for t in T for p in P for k in K))
-    
-    TC6 = (sum(XC_ir[t, p, i, r] * m.XD_ir[t, p, i, r] * d_ir[i, r] for t in T for p in P for i in I for r in R) +
-           sum(XC_jr[t, p, j, r] * m.XD_jr[t, p, j, r] * d_jr[j, r] for t in T for p in P for j in J for r in R) +
-           sum(XC_jh[t, p, j, h] * m.XD_jh[t, p, j, h] * d_jh[j, h] for t in T for p in P for j in J for h in H) +
-           sum(XC_jk[t, p, j, k] * m.XD_jk[t, p, j, k] * d_jk[j, k] for t in T for p in P for j in J for k in K) +
-           sum(XC_rh[t, p, r, h] * m.XD_rh[t, p, r, h] * d_rh[r, h] for t in T for p in P for r in R for h in H) +
-           sum(XC_rk[t, p, r, k] * m.XD_rk[t, p, r, k] * d_rk[r, k] for t in T for p in P for r in R for k in K) +
-           sum(XC_rr[t, p, r1, r2] * m.XD_rr[t, p, r1, r2] * d_rr[r1, r2] for t in T for p in P for r1 in R for r2 in R if r1 != r2) +
-           sum(XC_ru[t, p, r, u] * m.XD_ru[t, p, r, u] * d_ru[r, u] for t in T for p in P for r in R for u in U) +
-           sum(XC_hu[t, p, h, u] * m.XD_hu[t, p, h, u] * d_hu[h, u] for t in T for p in P for h in H for u in U) +
-           sum(XC_ku[t, p, k, u] * m.XD_ku[t, p, k, u] * d_ku[k, u] for t in T for p in P for k in K for u in U))
-    
-    emision_total = (sum(EP[t, p, r] * m.PR[t, p, r] for t in T for p in P for r in R) +
-                     sum(EI_r[t, p, r] * m.IR[t, p, r] for t in T for p in P for r in R) +
-                     sum(EI_h[t, p, h] * m.IH[t, p, h] for t in T for p in P for h in H) +
-                     sum(EI_k[t, p, k] * m.IK[t, p, k] for t in T for p in P for k in K) +
-                     sum(EX_ir[t, p, i, r] * m.XD_ir[t, p, i, r] * d_ir[i, r] for t in T for p in P for i in I for r in R) +
-                     sum(EX_jr[t, p, j, r] * m.XD_jr[t, p, j, r] * d_jr[j, r] for t in T for p in P for j in J for r in R) +
-                     sum(EX_jh[t, p, j, h] * m.XD_jh[t, p, j, h] * d_jh[j, h] for t in T for p in P for j in J for h in H) +
-                     sum(EX_jk[t, p, j, k] * m.XD_jk[t, p, j, k] * d_jk[j, k] for t in T for p in P for j in J for k in K) +
-                     sum(EX_rh[t, p, r, h] * m.XD_rh[t, p, r, h] * d_rh[r, h] for t in T for p in P for r in R for h in H) +
-                     sum(EX_rk[t, p, r, k] * m.XD_rk[t, p, r, k] * d_rk[r, k] for t in T for p in P for r in R for k in K))
-    
-    TC7 = EC * emision_total
-    
-    beneficio_total = revenue - (TC1 + TC2 + TC3 + TC4 + TC5 + TC6 + TC7)
-    
-    # Cumplimiento (Ecuaciones 11 y 12 del documento)
-    demanda_total_h = sum(DM_h[t, p, h] for t in T for p in P for h in H)
-    demanda_total_k = sum(DM_k[t, p, k] for t in T for p in P for k in K)
+    Args:
+        m: Modelo creado con crear_modelo_base()
+        pesos: Tupla (W1, W2, W3); por defecto los pesos del caso de estudio
+    Returns:
+        LinearExpression del objetivo a maximizar
+    """
+    w1, w2, w3 = (W1, W2, W3) if pesos is None else pesos
+    # Pesos del objetivo vigente (resolver_con_arranque_en_caliente lo reconstruye
+    # con ellos si una demanda total pasa a cero o deja de serlo)
+    m.pesos_objetivo = (w1, w2, w3)
+    
+    # Todos los componentes del objetivo son lineales en las variables, así que se
+    # construye una sola LinearExpression en la que cada variable aparece una vez
+    # con su coeficiente combinado:
+    #   Z = W1*(Beneficio/Z_Pro_ref) + W2*(TLS/T_LS_ref) - W3*(Emisiones/T_E_ref)
+    #   Beneficio = Ingresos - (TC1 + TC2 + TC3 + TC4 + TC5 + TC6 + TC7), TC7 = EC*Emisiones
+    #   TLS = TSH + TSK = RHO*Suministro_H/Demanda_H + (1-RHO)*Suministro_K/Demanda_K
+    
+    # Peso en el objetivo de 1 IDR de beneficio y de 1 kg CO2e emitido (TC7 + emisiones)
+    peso_beneficio = w1 / Z_Pro_ref
+    peso_emision = w1 * EC / Z_Pro_ref + w3 / T_E_ref
+    
+    # Cumplimiento (Ecuaciones 11 y 12 del documento): peso de cada unidad entregada.
+    # Sin demanda la tasa vale RHO (o 1-RHO) y pasa a ser un término constante
+    constante = 0
+    if value(m.demanda_total_h) > 0:
+        peso_h = w2 * RHO / (T_LS_ref * m.demanda_total_h)
+    else:
+        peso_h, constante = 0, constante + w2 * RHO / T_LS_ref
+    if value(m.demanda_total_k) > 0:
+        peso_k = w2 * (1 - RHO) / (T_LS_ref * m.demanda_total_k)
+    else:
+        peso_k, constante = 0, constante + w2 * (1 - RHO) / T_LS_ref
+    
+    # Coeficientes fijos de cada grupo de variables como arreglos NumPy con la forma
+    # de m.vars_planas[...]
+    V = m.vars_planas
+    coef_PR = -peso_beneficio * OC_arr
+    coef_IR = -peso_beneficio * IC_r_arr - peso_emision * EI_r_arr
+    coef_IH = -peso_beneficio * IC_h_arr - peso_emision * EI_h_arr
+    coef_IK = -peso_beneficio * IC_k_arr - peso_emision * EI_k_arr
+    coef_ir = -peso_beneficio * (PC_ir_arr + CD_ir_arr) - peso_emision * EXD_ir_arr
+    coef_jr = -peso_beneficio * (PC_jr_arr + CD_jr_arr) - peso_emision * EXD_jr_arr
+    coef_jh = -peso_beneficio * CD_jh_arr - peso_emision * EXD_jh_arr
+    coef_jk = -peso_beneficio * CD_jk_arr - peso_emision * EXD_jk_arr
+    coef_rh = peso_beneficio * (SP_rh_arr - CD_rh_arr) - peso_emision * EXD_rh_arr
+    coef_rk = peso_beneficio * (SP_rk_arr - CD_rk_arr) - peso_emision * EXD_rk_arr
+    
+    # Las emisiones de producción (m.EP) y los pesos de cumplimiento son parámetros
+    # mutables: esos coeficientes se completan como listas planas de expresiones
+    EP_plano = variables_planas(m.EP, T, P, R).ravel().tolist()
+    
+    # Un solo recorrido por grupo de variables: coeficientes y variables se agregan
+    # directamente a las dos listas de la LinearExpression (sin pares intermedios)
+    linear_coefs, linear_vars = [], []
+    
+    def agregar(coefs, variables):
+        coefs, variables = terminos_planos(coefs, variables)
+        linear_coefs.extend(coefs)
+        linear_vars.extend(variables)
+    
+    # Activación de instalaciones: TC1
+    agregar(-peso_beneficio * FC_BM, V['y_i'])
+    agregar(-peso_beneficio * FC_LBDC, V['y_j'])
+    # Producción: TC3 y emisiones de producción
+    agregar([c - peso_emision * ep for c, ep in zip(coef_PR.ravel().tolist(), EP_plano)], V['PR'])
+    # Inventarios: TC4 y emisiones de almacenamiento
+    agregar(coef_IR, V['IR'])
+    agregar(coef_IH, V['IH'])
+    agregar(coef_IK, V['IK'])
+    # Obsolescencia: TC5
+    agregar(-peso_beneficio * WC_r_arr, V['WO_r'])
+    agregar(-peso_beneficio * WC_h_arr, V['WO_h'])
+    agregar(-peso_beneficio * WC_k_arr, V['WO_k'])
+    # Recolección hacia bancos regionales: TC2, TC6 y emisiones de transporte
+    agregar(coef_ir, V['XD_ir'])
+    agregar(coef_jr, V['XD_jr'])
+    # Entregas a hospitales y clínicas: ingresos (solo desde R), TC6, emisiones y cumplimiento
+    agregar([c + peso_h for c in coef_jh.ravel().tolist()], V['XD_jh'])
+    agregar([c + peso_k for c in coef_jk.ravel().tolist()], V['XD_jk'])
+    agregar([c + peso_h for c in coef_rh.ravel().tolist()], V['XD_rh'])
+    agregar([c + peso_k for c in coef_rk.ravel().tolist()], V['XD_rk'])
+    # Transferencias entre bancos (solo pares r1 != r2) y envíos a residuos: solo TC6
+    agregar(-peso_beneficio * CD_rr_arr[:, :, RR_pos[0], RR_pos[1]], V['XD_rr'])
+    agregar(-peso_beneficio * CD_ru_arr, V['XD_ru'])
+    agregar(-peso_beneficio * CD_hu_arr, V['XD_hu'])
+    agregar(-peso_beneficio * CD_ku_arr, V['XD_ku'])
     
-    # Sumar flujos por separado
-    suministro_h = (sum(m.XD_jh[t, p, j, h] for t in T for p in P for j in J for h in H) +
-                    sum(m.XD_rh[t, p, r, h] for t in T for p in P for r in R for h in H))
-    suministro_k = (sum(m.XD_jk[t, p, j, k] for t in T for p in P for j in J for k in K) +
-                    sum(m.XD_rk[t, p, r, k] for t in T for p in P for r in R for k in K))
+    # FUNCIÓN COMBINADA CON NORMALIZACIÓN CORRECTA
+    return LinearExpression(constant=constante, linear_coefs=linear_coefs, linear_vars=linear_vars)
+
+def resolver_con_pesos(modelo, pesos):
+    """Vuelve a resolver un modelo ya resuelto con otra combinación de pesos
     
-    # CRÍTICO: TSH y TSK según Ecs. 11 y 12 (incluyen factor de ponderación)
-    TSH = RHO * (suministro_h / demanda_total_h) if demanda_total_h > 0 else RHO
-    TSK = (1 - RHO) * (suministro_k / demanda_total_k) if demanda_total_k > 0 else (1 - RHO)
+    Pensado para barridos de pesos (frente de Pareto): los pesos solo aparecen en
+    el objetivo, así que se reemplaza únicamente el objetivo y HiGHS reoptimiza
+    en memoria partiendo de la base óptima anterior, sin reconstruir ni revisar las
+    restricciones.
     
-    # TLS = TSH + TSK (Eq. 10)
-    tasa_cumplimiento = TSH + TSK
+    Args:
+        modelo: Modelo creado con crear_modelo_base() y resuelto con resolver()
+        pesos: Tupla (W1, W2, W3)
+    Returns:
+        Resultados de appsi (ver resolver)
+    """
+    modelo.del_component(modelo.objetivo)
+    modelo.objetivo = Objective(expr=objetivo_combinado_corregido(modelo, pesos), sense=maximize)
+    return resolver_sin_revisar_estructura(
+        modelo, revisar=('check_for_new_objective', 'update_objective'))
+
+# ===========================
+# MÉTRICAS DE LA SOLUCIÓN
+# ===========================
+
+def calcular_metricas(modelo):
+    """Calcula beneficio, emisiones y cumplimiento de la solución cargada en el modelo
     
-    # FUNCIÓN COMBINADA CON NORMALIZACIÓN CORRECTA
-    Z_combinado = (W1 * (beneficio_total / Z_Pro_ref) +
-                   W2 * (tasa_cumplimiento / T_LS_ref) -
-                   W3 * (emision_total / T_E_ref))
-    
-    return Z_combinado
-
-modelo_final.objetivo = Objective(rule=objetivo_combinado_corregido, sense=maximize)
-
-solucion_final = solver.solve(modelo_final, tee=True)
-
-if solucion_final.solver.termination_condition == TerminationCondition.optimal:
-   
-    # Calcular métricas
-    revenue = (sum(SP_rh[t, p, r, h] * value(modelo_final.XD_rh[t, p, r, h]) for t in T for p in P for r in R for h in H) +
-              sum(SP_rk[t, p, r, k] * value(modelo_final.XD_rk[t, p, r, k]) for t in T for p in P for r in R for k in K))
-    
-    TC1 = (sum(FC_BM * value(modelo_final.y_i[t, i]) for t in T for i in I) +
-           sum(FC_LBDC * value(modelo_final.y_j[t, j]) for t in T for j in J))
-    
-    TC2 = (sum(PC_ir[t, p, i, r] * value(modelo_final.XD_ir[t, p, i, r]) for t in T for p in P for i in I for r in R) +
-           sum(PC_jr[t, p, j, r] * value(modelo_final.XD_jr[t, p, j, r]) for t in T for p in P for j in J for r in R))
-    
-    TC3 = sum(OC[t, p, r] * value(modelo_final.PR[t, p, r]) for t in T for p in P for r in R)
-    
-    TC4 = (sum(IC_r[t, p, r] * value(modelo_final.IR[t, p, r]) for t in T for p in P for r in R) +
-           sum(IC_h[t, p, h] * value(modelo_final.IH[t, p, h]) for t in T for p in P for h in H) +
-           sum(IC_k[t, p, k] * value(modelo_final.IK[t, p, k]) for t in T for p in P for k in K))
-    
-    TC5 = (sum(WC_r[t, p, r] * value(modelo_final.WO_r[t, p, r]) for t in T for p in P for r in R) +
-           sum(WC_h[t, p, h] * value(modelo_final.WO_h[t, p, h]) for t in T for p in P for h in H) +
-           sum(WC_k[t, p, k] * value(modelo_final.WO_k[t, p, k]) for t in T for p in P for k in K))
-    
-    TC6 = (sum(XC_ir[t, p, i, r] * value(modelo_final.XD_ir[t, p, i, r]) * d_ir[i, r] for t in T for p in P for i in I for r in R) +
-           sum(XC_jr[t, p, j, r] * value(modelo_final.XD_jr[t, p, j, r]) * d_jr[j, r] for t in T for p in P for j in J for r in R) +
-           sum(XC_jh[t, p, j, h] * value(modelo_final.XD_jh[t, p, j, h]) * d_jh[j, h] for t in T for p in P for j in J for h in H) +
-           sum(XC_jk[t, p, j, k] * value(modelo_final.XD_jk[t, p, j, k]) * d_jk[j, k] for t in T for p in P for j in J for k in K) +
-           sum(XC_rh[t, p, r, h] * value(modelo_final.XD_rh[t, p, r, h]) * d_rh[r, h] for t in T for p in P for r in R for h in H) +
-           sum(XC_rk[t, p, r, k] * value(modelo_final.XD_rk[t, p, r, k]) * d_rk[r, k] for t in T for p in P for r in R for k in K) +
-           sum(XC_rr[t, p, r1, r2] * value(modelo_final.XD_rr[t, p, r1, r2]) * d_rr[r1, r2] for t in T for p in P for r1 in R for r2 in R if r1 != r2) +
-           sum(XC_ru[t, p, r, u] * value(modelo_final.XD_ru[t, p, r, u]) * d_ru[r, u] for t in T for p in P for r in R for u in U) +
-           sum(XC_hu[t, p, h, u] * value(modelo_final.XD_hu[t, p, h, u]) * d_hu[h, u] for t in T for p in P for h in H for u in U) +
-           sum(XC_ku[t, p, k, u] * value(modelo_final.XD_ku[t, p, k, u]) * d_ku[k, u] for t in T for p in P for k in K for u in U))
-    
-    emision_produccion = sum(EP[t, p, r] * value(modelo_final.PR[t, p, r]) for t in T for p in P for r in R)
-    emision_inventario = (sum(EI_r[t, p, r] * value(modelo_final.IR[t, p, r]) for t in T for p in P for r in R) +
-                         sum(EI_h[t, p, h] * value(modelo_final.IH[t, p, h]) for t in T for p in P for h in H) +
-                         sum(EI_k[t, p, k] * value(modelo_final.IK[t, p, k]) for t in T for p in P for k in K))
-    emision_transporte = (sum(EX_ir[t, p, i, r] * value(modelo_final.XD_ir[t, p, i, r]) * d_ir[i, r] for t in T for p in P for i in I for r in R) +
-                         sum(EX_jr[t, p, j, r] * value(modelo_final.XD_jr[t, p, j, r]) * d_jr[j, r] for t in T for p in P for j in J for r in R) +
-                         sum(EX_jh[t, p, j, h] * value(modelo_final.XD_jh[t, p, j, h]) * d_jh[j, h] for t in T for p in P for j in J for h in H) +
-                         sum(EX_jk[t, p, j, k] * value(modelo_final.XD_jk[t, p, j, k]) * d_jk[j, k] for t in T for p in P for j in J for k in K) +
-                         sum(EX_rh[t, p, r, h] * value(modelo_final.XD_rh[t, p, r, h]) * d_rh[r, h] for t in T for p in P for r in R for h in H) +
-                         sum(EX_rk[t, p, r, k] * value(modelo_final.XD_rk[t, p, r, k]) * d_rk[r, k] for t in T for p in P for r in R for k in K))
+    Args:
+        modelo: Modelo resuelto con la solución cargada en sus variables
+    Returns:
+        Diccionario con beneficio_total [IDR], emision_total [kg CO2e], TSH y TSK [%]
+    """
+    # Los valores de la solución se extraen una sola vez como arreglos NumPy con la
+    # misma forma que los arreglos de parámetros (XD_rr: ejes (T, P, RR_pairs), a
+    # los que se llevan los arreglos R x R con RR_pos); cada métrica es un producto
+    # elemento a elemento seguido de una suma vectorizada
+    V = modelo.vars_planas
+    X = {nombre: valores_planos(variables) for nombre, variables in V.items()}
+    EP_val = valores_planos(variables_planas(modelo.EP, T, P, R))
+    
+    revenue = (SP_rh_arr * X['XD_rh']).sum() + (SP_rk_arr * X['XD_rk']).sum()
+    
+    TC1 = FC_BM * X['y_i'].sum() + FC_LBDC * X['y_j'].sum()
+    
+    TC2 = (PC_ir_arr * X['XD_ir']).sum() + (PC_jr_arr * X['XD_jr']).sum()
+    
+    TC3 = (OC_arr * X['PR']).sum()
+    
+    TC4 = ((IC_r_arr * X['IR']).sum() +
+           (IC_h_arr * X['IH']).sum() +
+           (IC_k_arr * X['IK']).sum())
+    
+    TC5 = ((WC_r_arr * X['WO_r']).sum() +
+           (WC_h_arr * X['WO_h']).sum() +
+           (WC_k_arr * X['WO_k']).sum())
+    
+    TC6 = ((CD_ir_arr * X['XD_ir']).sum() +
+           (CD_jr_arr * X['XD_jr']).sum() +
+           (CD_jh_arr * X['XD_jh']).sum() +
+           (CD_jk_arr * X['XD_jk']).sum() +
+           (CD_rh_arr * X['XD_rh']).sum() +
+           (CD_rk_arr * X['XD_rk']).sum() +
+           (CD_rr_arr[:, :, RR_pos[0], RR_pos[1]] * X['XD_rr']).sum() +
+           (CD_ru_arr * X['XD_ru']).sum() +
+           (CD_hu_arr * X['XD_hu']).sum() +
+           (CD_ku_arr * X['XD_ku']).sum())
+    
+    emision_produccion = (EP_val * X['PR']).sum()
+    emision_inventario = ((EI_r_arr * X['IR']).sum() +
+                          (EI_h_arr * X['IH']).sum() +
+                          (EI_k_arr * X['IK']).sum())
+    emision_transporte = ((EXD_ir_arr * X['XD_ir']).sum() +
+                          (EXD_jr_arr * X['XD_jr']).sum() +
+                          (EXD_jh_arr * X['XD_jh']).sum() +
+                          (EXD_jk_arr * X['XD_jk']).sum() +
+                          (EXD_rh_arr * X['XD_rh']).sum() +
+                          (EXD_rk_arr * X['XD_rk']).sum())
     
     emision_total = emision_produccion + emision_inventario + emision_transporte
     TC7 = EC * emision_total
     
     beneficio_total = revenue - (TC1 + TC2 + TC3 + TC4 + TC5 + TC6 + TC7)
     
-    demanda_total_h = sum(DM_h[t, p, h] for t in T for p in P for h in H)
+    # Las demandas totales del modelo se mantienen sincronizadas con DM_h y DM_k
+    demanda_total_h = value(modelo.demanda_total_h)
     #  Sumar flujos por separado
-    suministro_h = (sum(value(modelo_final.XD_jh[t, p, j, h]) for t in T for p in P for j in J for h in H) +
-                    sum(value(modelo_final.XD_rh[t, p, r, h]) for t in T for p in P for r in R for h in H))
+    suministro_h = X['XD_jh'].sum() + X['XD_rh'].sum()
     TSH = (suministro_h / demanda_total_h * 100) if demanda_total_h > 0 else 100.0
     
-    demanda_total_k = sum(DM_k[t, p, k] for t in T for p in P for k in K)
+    demanda_total_k = value(modelo.demanda_total_k)
     #  Sumar flujos por separado
-    suministro_k = (sum(value(modelo_final.XD_jk[t, p, j, k]) for t in T for p in P for j in J for k in K) +
-                    sum(value(modelo_final.XD_rk[t, p, r, k]) for t in T for p in P for r in R for k in K))
+    suministro_k = X['XD_jk'].sum() + X['XD_rk'].sum()
     TSK = (suministro_k / demanda_total_k * 100) if demanda_total_k > 0 else 100.0
+    
+    return {'beneficio_total': beneficio_total, 'emision_total': emision_total,
+            'TSH': TSH, 'TSK': TSK}
+
+# ===========================
+# BARRIDO DE PESOS EN PARALELO
+# ===========================
+# Cada combinación de pesos (W1, W2, W3) es un problema independiente: cada
+# proceso construye y resuelve su propio modelo (los objetos de Pyomo no se
+# comparten entre procesos) y devuelve solo las métricas
+
+def resolver_escenario_pesos(pesos):
+    """Construye, resuelve y evalúa un modelo independiente con los pesos dados
+    
+    Args:
+        pesos: Tupla (W1, W2, W3)
+    Returns:
+        Diccionario con los pesos, la condición de terminación y, si la solución es
+        óptima, el valor del objetivo y las métricas de calcular_metricas()
+    """
+    modelo = crear_modelo_base()
+    modelo.objetivo = Objective(expr=objetivo_combinado_corregido(modelo, pesos), sense=maximize)
+    resultados = resolver(modelo)
+    escenario = {'pesos': pesos, 'terminacion': str(resultados.termination_condition)}
+    if resultados.termination_condition == appsi.base.TerminationCondition.optimal:
+        escenario['objetivo'] = value(modelo.objetivo)
+        escenario.update(calcular_metricas(modelo))
+    return escenario
+
+def _configurar_solver_proceso():
+    """Inicializador de cada proceso del barrido
+    
+    Sin salida del solver (se intercalaría entre procesos) y HiGHS en un solo hilo:
+    el paralelismo lo dan los procesos, uno por núcleo
+    """
+    solver.config.stream_solver = False
+    solver.highs_options = {'threads': 1, 'parallel': 'off'}
 
+def barrido_pesos_paralelo(combinaciones, max_workers=None):
+    """Resuelve varias combinaciones de pesos en procesos separados
     
-    print(f"\n" + "="*70)
-    print("🎯 COMPARACIÓN CON OBJETIVOS")
-    print("="*70)
-    print(f"{'Métrica':<30} {'Objetivo':<20} {'Obtenido':<20} {'Estado'}")
-    print("-"*70)
-    print(f"{'Beneficio Total':<30} {'~IDR 4.49B':<20} {f'IDR {beneficio_total/1e9:.2f}B':<20} {'✓' if 3e9 < beneficio_total < 6e9 else '✗'}")
-    print(f"{'Emisiones Totales':<30} {'~203.94 kg':<20} {f'{emision_total:.2f} kg':<20} {'✓' if 150 < emision_total < 300 else '✗'}")
-    print(f"{'Cumplimiento Hospitales':<30} {'~109.13%':<20} {f'{TSH:.2f}%':<20} {'✓' if 100 < TSH < 120 else '✗'}")
-    print(f"{'Cumplimiento Clínicas':<30} {'~154.57%':<20} {f'{TSK:.2f}%':<20} {'✓' if 140 < TSK < 170 else '✗'}")
+    Args:
+        combinaciones: Lista de tuplas (W1, W2, W3)
+        max_workers: Número de procesos (por defecto, un proceso por núcleo)
+    Returns:
+        Lista de diccionarios de resolver_escenario_pesos(), en el orden de combinaciones
+    """
+    # Procesos nuevos (spawn) en lugar de copias (fork): si el proceso principal ya
+    # resolvió, una copia heredaría el planificador global de hilos de HiGHS (con
+    # threads = núcleos) y HiGHS rechazaría threads = 1 en cada proceso del barrido
+    with ProcessPoolExecutor(max_workers=max_workers or os.cpu_count(),
+                             mp_context=multiprocessing.get_context('spawn'),
+                             initializer=_configurar_solver_proceso) as ejecutor:
+        return list(ejecutor.map(resolver_escenario_pesos, combinaciones))
+
+# ===========================
+# RESOLVER MODELO MULTI-OBJETIVO CON NORMALIZACIÓN MANUAL
+# ===========================
+# Solo al ejecutar el script directamente: los procesos del barrido importan
+# este módulo y no deben repetir la resolución principal
+
+if __name__ == "__main__":
+    modelo_final = crear_modelo_base()
+    modelo_final.objetivo = Objective(rule=objetivo_combinado_corregido, sense=maximize)
+    
+    solucion_final = resolver(modelo_final)
     
-else:
-    print("\n❌ No se encontró solución óptima")
-    print(f"Terminación: {solucion_final.solver.termination_condition}")
+    if solucion_final.termination_condition == appsi.base.TerminationCondition.optimal:
+        # Calcular métricas
+        metricas = calcular_metricas(modelo_final)
+        beneficio_total, emision_total = metricas['beneficio_total'], metricas['emision_total']
+        TSH, TSK = metricas['TSH'], metricas['TSK']
+        
+        print(f"\n" + "="*70)
+        print("🎯 COMPARACIÓN CON OBJETIVOS")
+        print("="*70)
+        print(f"{'Métrica':<30} {'Objetivo':<20} {'Obtenido':<20} {'Estado'}")
+        print("-"*70)
+        print(f"{'Beneficio Total':<30} {'~IDR 4.49B':<20} {f'IDR {beneficio_total/1e9:.2f}B':<20} {'✓' if 3e9 < beneficio_total < 6e9 else '✗'}")
+        print(f"{'Emisiones Totales':<30} {'~203.94 kg':<20} {f'{emision_total:.2f} kg':<20} {'✓' if 150 < emision_total < 300 else '✗'}")
+        print(f"{'Cumplimiento Hospitales':<30} {'~109.13%':<20} {f'{TSH:.2f}%':<20} {'✓' if 100 < TSH < 120 else '✗'}")
+        print(f"{'Cumplimiento Clínicas':<30} {'~154.57%':<20} {f'{TSK:.2f}%':<20} {'✓' if 140 < TSK < 170 else '✗'}")
+    
+    else:
+        print("\n❌ No se encontró solución óptima")
+        print(f"Terminación: {solucion_final.termination_condition}")